@@ -1,11 +1,22 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.errors import (
+    BulkWriteError, ConnectionFailure, PyMongoError, ServerSelectionTimeoutError
+)
+import bson
+from bson.raw_bson import RawBSONDocument
+import asyncio
+import base64
+import numpy as np
+import orjson
+import redis.asyncio as redis
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
@@ -15,13 +26,53 @@ from enum import Enum
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection. The pool budget is shared by every worker process
+# (WEB_CONCURRENCY), so adding workers does not multiply Mongo connections.
+MONGO_MAX_CONNECTIONS = 50
+MONGO_MIN_CONNECTIONS = 10
+MONGO_MIN_POOL_PER_WORKER = 5
+
+
+def mongo_pool_options(workers):
+    return {
+        "maxPoolSize": max(MONGO_MIN_POOL_PER_WORKER, MONGO_MAX_CONNECTIONS // workers),
+        "minPoolSize": max(1, MONGO_MIN_CONNECTIONS // workers),
+    }
+
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(
+    mongo_url,
+    **mongo_pool_options(max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))),
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=3000,
+    connectTimeoutMS=2000,
+)
 db = client[os.environ['DB_NAME']]
 
+# Redis cache for read-heavy, staleness-tolerant endpoints
+# The cache is best-effort: if Redis is unreachable, requests fall through to Mongo
+cache = redis.from_url(
+    os.environ.get('REDIS_URL', 'redis://localhost:6379'),
+    socket_connect_timeout=0.5,
+    socket_timeout=0.5,
+)
+CACHE_TTL_SECONDS = 3
+DASHBOARD_STATS_KEY = "dash:stats"
+AVAILABLE_DRIVERS_KEY = "drivers:available"
+
+# Orders created concurrently are grouped into one insert_many. Every
+# request still waits for its own batch to be written before responding.
+ORDER_BATCH_SIZE = 100
+# MongoDB rejects documents larger than this
+MAX_ORDER_BSON_SIZE = 16 * 1024 * 1024
+ORDER_WRITE_RETRIES = 3
+ORDER_WRITE_RETRY_DELAY = 0.05
+_order_buffer = []
+_order_flush_task = None
+
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -45,7 +96,7 @@ class DriverStatus(str, Enum):
 
 # Data Models
 class Customer(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     name: str
     phone: str
     address: str
@@ -53,7 +104,7 @@ class Customer(BaseModel):
 
 
 class Driver(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     name: str
     phone: str
     vehicle_type: str
@@ -63,7 +114,7 @@ class Driver(BaseModel):
 
 
 class Restaurant(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     name: str
     address: str
     phone: str
@@ -73,13 +124,14 @@ class Restaurant(BaseModel):
 
 class OrderItem(BaseModel):
     name: str
-    quantity: int
+    # Bounded to what both BSON and the vectorized total's int64 can hold
+    quantity: int = Field(ge=1, lt=2**63)
     price: float
     notes: Optional[str] = None
 
 
 class Order(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     customer_id: str
     customer_name: str
     customer_phone: str
@@ -98,6 +150,26 @@ class Order(BaseModel):
     delivered_at: Optional[datetime] = None
 
 
+# Handlers stamp times in the same format model_dump(mode="json") writes
+# created_at in, so a stored document never mixes "Z" and "+00:00"
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
+
+def utc_now_json():
+    return _DATETIME_ADAPTER.dump_python(datetime.now(timezone.utc), mode="json")
+
+
+# Only fetch the fields each model needs, and never Mongo's _id
+def model_projection(model):
+    return {"_id": 0, **{field: 1 for field in model.model_fields}}
+
+
+CUSTOMER_PROJECTION = model_projection(Customer)
+DRIVER_PROJECTION = model_projection(Driver)
+RESTAURANT_PROJECTION = model_projection(Restaurant)
+ORDER_PROJECTION = model_projection(Order)
+
+
 # Create Models
 class CustomerCreate(BaseModel):
     name: str
@@ -131,28 +203,76 @@ class OrderStatusUpdate(BaseModel):
     status: OrderStatus
 
 
-# Utility function for MongoDB serialization
-def prepare_for_mongo(data):
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if isinstance(value, datetime):
-                data[key] = value.isoformat()
-            elif isinstance(value, list):
-                data[key] = [prepare_for_mongo(item) if isinstance(item, dict) else item for item in value]
-    return data
+# Keyset pagination over (created_at, id), newest first. Without an explicit
+# limit the list endpoints still return up to LIST_LIMIT documents.
+LIST_LIMIT = 1000
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PAGE_SORT = [("created_at", -1), ("id", -1)]
+
 
+def encode_cursor(document):
+    raw = orjson.dumps([document["created_at"], document["id"]])
+    return base64.urlsafe_b64encode(raw).decode()
 
-def parse_from_mongo(item):
-    if isinstance(item, dict):
-        for key, value in item.items():
-            if isinstance(value, str) and 'T' in value and key.endswith(('_at', 'created_at')):
-                try:
-                    item[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                except:
-                    pass
-            elif isinstance(value, list):
-                item[key] = [parse_from_mongo(i) if isinstance(i, dict) else i for i in value]
-    return item
+
+def decode_cursor(cursor):
+    try:
+        created_at, last_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(created_at, str) or not isinstance(last_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, last_id
+
+
+def page_filter(filter_dict, after):
+    if not after:
+        return filter_dict
+    created_at, last_id = decode_cursor(after)
+    # created_at is not unique, so ties are broken by id
+    return {
+        **filter_dict,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": last_id}},
+        ],
+    }
+
+
+async def find_page(collection, filter_dict, projection, limit, after):
+    limit = limit or LIST_LIMIT
+    items = await collection.find(
+        page_filter(filter_dict, after), projection, batch_size=limit
+    ).sort(PAGE_SORT).limit(limit).to_list(length=limit)
+    headers = {}
+    if len(items) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1])
+    # Stored documents are already in the response shape (datetimes as ISO
+    # strings), so skip response_model validation and its datetime round trip
+    return ORJSONResponse(items, headers=headers)
+
+
+async def cache_get(key):
+    try:
+        return await cache.get(key)
+    except redis.RedisError:
+        logger.warning("Cache read failed for %s", key, exc_info=True)
+        return None
+
+
+async def cache_set(key, value):
+    try:
+        await cache.set(key, value, ex=CACHE_TTL_SECONDS)
+    except redis.RedisError:
+        logger.warning("Cache write failed for %s", key, exc_info=True)
+
+
+async def invalidate_cache(*keys):
+    try:
+        await cache.delete(*keys)
+    except redis.RedisError:
+        logger.warning("Cache invalidation failed for %s", keys, exc_info=True)
 
 
 # Basic Routes
@@ -163,37 +283,50 @@ async def root():
 # Customer Routes
 @api_router.post("/customers", response_model=Customer)
 async def create_customer(customer: CustomerCreate):
-    customer_obj = Customer(**customer.dict())
-    customer_dict = prepare_for_mongo(customer_obj.dict())
+    customer_obj = Customer(**customer.model_dump())
+    customer_dict = customer_obj.model_dump(mode="json")
     await db.customers.insert_one(customer_dict)
     return customer_obj
 
 
 @api_router.get("/customers", response_model=List[Customer])
-async def get_customers():
-    customers = await db.customers.find().to_list(1000)
-    return [Customer(**parse_from_mongo(customer)) for customer in customers]
+async def get_customers(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+):
+    return await find_page(db.customers, {}, CUSTOMER_PROJECTION, limit, after)
 
 
 # Driver Routes
 @api_router.post("/drivers", response_model=Driver)
 async def create_driver(driver: DriverCreate):
-    driver_obj = Driver(**driver.dict())
-    driver_dict = prepare_for_mongo(driver_obj.dict())
+    driver_obj = Driver(**driver.model_dump())
+    driver_dict = driver_obj.model_dump(mode="json")
     await db.drivers.insert_one(driver_dict)
+    await invalidate_cache(DASHBOARD_STATS_KEY, AVAILABLE_DRIVERS_KEY)
     return driver_obj
 
 
 @api_router.get("/drivers", response_model=List[Driver])
-async def get_drivers():
-    drivers = await db.drivers.find().to_list(1000)
-    return [Driver(**parse_from_mongo(driver)) for driver in drivers]
+async def get_drivers(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+):
+    return await find_page(db.drivers, {}, DRIVER_PROJECTION, limit, after)
 
 
 @api_router.get("/drivers/available", response_model=List[Driver])
 async def get_available_drivers():
-    drivers = await db.drivers.find({"status": DriverStatus.AVAILABLE}).to_list(1000)
-    return [Driver(**parse_from_mongo(driver)) for driver in drivers]
+    cached = await cache_get(AVAILABLE_DRIVERS_KEY)
+    if cached:
+        return Response(content=cached, media_type="application/json")
+
+    drivers = await db.drivers.find(
+        {"status": DriverStatus.AVAILABLE}, DRIVER_PROJECTION, batch_size=1000
+    ).to_list(length=1000)
+    content = orjson.dumps(drivers)
+    await cache_set(AVAILABLE_DRIVERS_KEY, content)
+    return Response(content=content, media_type="application/json")
 
 
 @api_router.patch("/drivers/{driver_id}/status")
@@ -204,58 +337,156 @@ async def update_driver_status(driver_id: str, status: DriverStatus):
     )
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Driver not found")
+    await invalidate_cache(DASHBOARD_STATS_KEY, AVAILABLE_DRIVERS_KEY)
     return {"message": "Driver status updated"}
 
 
 # Restaurant Routes
 @api_router.post("/restaurants", response_model=Restaurant)
 async def create_restaurant(restaurant: RestaurantCreate):
-    restaurant_obj = Restaurant(**restaurant.dict())
-    restaurant_dict = prepare_for_mongo(restaurant_obj.dict())
+    restaurant_obj = Restaurant(**restaurant.model_dump())
+    restaurant_dict = restaurant_obj.model_dump(mode="json")
     await db.restaurants.insert_one(restaurant_dict)
     return restaurant_obj
 
 
 @api_router.get("/restaurants", response_model=List[Restaurant])
-async def get_restaurants():
-    restaurants = await db.restaurants.find().to_list(1000)
-    return [Restaurant(**parse_from_mongo(restaurant)) for restaurant in restaurants]
+async def get_restaurants(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+):
+    return await find_page(db.restaurants, {}, RESTAURANT_PROJECTION, limit, after)
 
 
 # Order Routes
+def _resolve_orders(batch, failed=False):
+    for _, future in batch:
+        # The request may have been cancelled while waiting
+        if future.done():
+            continue
+        if failed:
+            future.set_exception(HTTPException(status_code=503, detail="Order could not be saved"))
+        else:
+            future.set_result(None)
+
+
+async def _write_order_batch(batch):
+    global _order_buffer
+    documents = [document for document, _ in batch]
+    for attempt in range(ORDER_WRITE_RETRIES):
+        try:
+            await db.orders.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed = {
+                error["index"] for error in e.details.get("writeErrors", [])
+                # On a retry, a duplicate key means the earlier attempt wrote it
+                if not (attempt > 0 and error.get("code") == 11000)
+            }
+            if failed:
+                logger.error("Failed to write %d of %d orders", len(failed), len(batch))
+            _resolve_orders([entry for i, entry in enumerate(batch) if i not in failed])
+            _resolve_orders([entry for i, entry in enumerate(batch) if i in failed], failed=True)
+            return
+        except ServerSelectionTimeoutError:
+            # No server is reachable: retrying or writing the queued batches
+            # would only stack another selection timeout onto each request
+            logger.error("Mongo unavailable, failing %d queued orders", len(batch) + len(_order_buffer))
+            batch, _order_buffer = batch + _order_buffer, []
+            break
+        except ConnectionFailure:
+            logger.warning(
+                "Order batch write failed (attempt %d of %d)",
+                attempt + 1, ORDER_WRITE_RETRIES, exc_info=True
+            )
+            await asyncio.sleep(ORDER_WRITE_RETRY_DELAY)
+        except Exception:
+            logger.exception("Failed to write %d orders", len(batch))
+            break
+        else:
+            _resolve_orders(batch)
+            return
+    _resolve_orders(batch, failed=True)
+
+
+async def flush_orders():
+    global _order_buffer
+    while _order_buffer:
+        batch = _order_buffer[:ORDER_BATCH_SIZE]
+        _order_buffer = _order_buffer[ORDER_BATCH_SIZE:]
+        await _write_order_batch(batch)
+
+
+async def insert_order(order_dict):
+    """Insert an order, batched with any orders created concurrently."""
+    global _order_flush_task
+    # Encode once here: an oversized order (e.g. huge notes or item lists)
+    # is rejected on its own instead of failing the whole insert_many, and
+    # the raw document is sent as-is without being encoded again
+    document = RawBSONDocument(bson.encode(order_dict))
+    if len(document.raw) > MAX_ORDER_BSON_SIZE:
+        raise HTTPException(status_code=422, detail="Order is too large")
+    future = asyncio.get_running_loop().create_future()
+    _order_buffer.append((document, future))
+    # The flush runs on the next loop iteration, so requests that arrive
+    # meanwhile (or while a batch is in flight) join the next insert_many
+    if _order_flush_task is None or _order_flush_task.done():
+        _order_flush_task = asyncio.create_task(flush_orders())
+    await future
+
+
+# Below this many items NumPy's call overhead outweighs the vectorized sum
+VECTORIZED_TOTAL_MIN_ITEMS = 32
+
+
+def order_total(items):
+    if len(items) < VECTORIZED_TOTAL_MIN_ITEMS:
+        return sum(item.price * item.quantity for item in items)
+    prices = np.fromiter((item.price for item in items), dtype=np.float64, count=len(items))
+    quantities = np.fromiter((item.quantity for item in items), dtype=np.int64, count=len(items))
+    return float(prices @ quantities)
+
+
 @api_router.post("/orders", response_model=Order)
 async def create_order(order: OrderCreate):
-    # Find or create customer
-    existing_customer = await db.customers.find_one({"phone": order.customer_phone})
-    if not existing_customer:
-        customer_obj = Customer(
-            name=order.customer_name,
-            phone=order.customer_phone,
-            address=order.delivery_address
-        )
-        customer_dict = prepare_for_mongo(customer_obj.dict())
-        await db.customers.insert_one(customer_dict)
-        customer_id = customer_obj.id
-    else:
-        customer_id = existing_customer["id"]
-
-    # Find or create restaurant
-    existing_restaurant = await db.restaurants.find_one({"name": order.restaurant_name})
-    if not existing_restaurant:
-        restaurant_obj = Restaurant(
-            name=order.restaurant_name,
-            address="Address not provided",
-            phone="Phone not provided",
-            cuisine_type="General"
-        )
-        restaurant_dict = prepare_for_mongo(restaurant_obj.dict())
-        await db.restaurants.insert_one(restaurant_dict)
-        restaurant_id = restaurant_obj.id
-    else:
-        restaurant_id = existing_restaurant["id"]
+    # One timestamp shared by every document this request creates
+    now = datetime.now(timezone.utc)
+
+    # Find or create customer and restaurant concurrently, one round trip each
+    customer_doc = Customer(
+        name=order.customer_name,
+        phone=order.customer_phone,
+        address=order.delivery_address,
+        created_at=now
+    ).model_dump(mode="json", exclude={"phone"})
+    restaurant_doc = Restaurant(
+        name=order.restaurant_name,
+        address="Address not provided",
+        phone="Phone not provided",
+        cuisine_type="General",
+        created_at=now
+    ).model_dump(mode="json", exclude={"name"})
+
+    customer, restaurant = await asyncio.gather(
+        db.customers.find_one_and_update(
+            {"phone": order.customer_phone},
+            {"$setOnInsert": customer_doc},
+            projection={"_id": 0, "id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        ),
+        db.restaurants.find_one_and_update(
+            {"name": order.restaurant_name},
+            {"$setOnInsert": restaurant_doc},
+            projection={"_id": 0, "id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        ),
+    )
+    customer_id = customer["id"]
+    restaurant_id = restaurant["id"]
 
     # Calculate total amount
-    total_amount = sum(item.price * item.quantity for item in order.items)
+    total_amount = order_total(order.items)
 
     # Create order
     order_obj = Order(
@@ -267,61 +498,78 @@ async def create_order(order: OrderCreate):
         restaurant_name=order.restaurant_name,
         items=order.items,
         total_amount=total_amount,
-        notes=order.notes
+        notes=order.notes,
+        created_at=now
     )
     
-    order_dict = prepare_for_mongo(order_obj.dict())
-    await db.orders.insert_one(order_dict)
+    await insert_order(order_obj.model_dump(mode="json"))
+    await invalidate_cache(DASHBOARD_STATS_KEY)
     return order_obj
 
 
 @api_router.get("/orders", response_model=List[Order])
-async def get_orders(status: Optional[OrderStatus] = Query(None)):
+async def get_orders(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    status: Optional[OrderStatus] = Query(None),
+):
     filter_dict = {}
     if status:
         filter_dict["status"] = status
         
-    orders = await db.orders.find(filter_dict).to_list(1000)
-    return [Order(**parse_from_mongo(order)) for order in orders]
+    return await find_page(db.orders, filter_dict, ORDER_PROJECTION, limit, after)
 
 
 @api_router.get("/orders/{order_id}", response_model=Order)
 async def get_order(order_id: str):
-    order = await db.orders.find_one({"id": order_id})
+    order = await db.orders.find_one({"id": order_id}, ORDER_PROJECTION)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return Order(**parse_from_mongo(order))
+    return ORJSONResponse(order)
+
+
+async def release_driver(driver_id, order_id):
+    # Only free the driver if it is still on this order
+    await db.drivers.update_one(
+        {"id": driver_id, "current_order_id": order_id},
+        {"$set": {"status": DriverStatus.AVAILABLE, "current_order_id": None}}
+    )
 
 
 @api_router.patch("/orders/{order_id}/assign/{driver_id}")
 async def assign_order_to_driver(order_id: str, driver_id: str):
-    # Get driver info
-    driver = await db.drivers.find_one({"id": driver_id})
+    # Atomically claim the driver so it cannot be taken or go offline in between
+    driver = await db.drivers.find_one_and_update(
+        {"id": driver_id, "status": DriverStatus.AVAILABLE},
+        {"$set": {"status": DriverStatus.BUSY, "current_order_id": order_id}},
+        projection={"_id": 0, "name": 1},
+        return_document=ReturnDocument.AFTER
+    )
     if not driver:
-        raise HTTPException(status_code=404, detail="Driver not found")
+        raise HTTPException(status_code=404, detail="Driver not found or not available")
     
-    # Update order
-    order_result = await db.orders.update_one(
-        {"id": order_id, "status": OrderStatus.PENDING},
-        {
-            "$set": {
-                "status": OrderStatus.ASSIGNED,
-                "driver_id": driver_id,
-                "driver_name": driver["name"],
-                "assigned_at": datetime.now(timezone.utc).isoformat()
+    # Update order, releasing the driver claimed above if that fails
+    try:
+        order_result = await db.orders.update_one(
+            {"id": order_id, "status": OrderStatus.PENDING},
+            {
+                "$set": {
+                    "status": OrderStatus.ASSIGNED,
+                    "driver_id": driver_id,
+                    "driver_name": driver["name"],
+                    "assigned_at": utc_now_json()
+                }
             }
-        }
-    )
+        )
+    except PyMongoError:
+        await release_driver(driver_id, order_id)
+        raise
     
     if order_result.modified_count == 0:
+        await release_driver(driver_id, order_id)
         raise HTTPException(status_code=404, detail="Order not found or already assigned")
     
-    # Update driver status
-    await db.drivers.update_one(
-        {"id": driver_id},
-        {"$set": {"status": DriverStatus.BUSY, "current_order_id": order_id}}
-    )
-    
+    await invalidate_cache(DASHBOARD_STATS_KEY, AVAILABLE_DRIVERS_KEY)
     return {"message": "Order assigned successfully"}
 
 
@@ -330,46 +578,62 @@ async def update_order_status(order_id: str, status_update: OrderStatusUpdate):
     update_data = {"status": status_update.status}
     
     # Add timestamp based on status
-    current_time = datetime.now(timezone.utc).isoformat()
+    current_time = utc_now_json()
     if status_update.status == OrderStatus.PICKED_UP:
         update_data["picked_up_at"] = current_time
     elif status_update.status == OrderStatus.DELIVERED:
         update_data["delivered_at"] = current_time
-        
-        # Free up the driver when order is delivered
-        order = await db.orders.find_one({"id": order_id})
-        if order and order.get("driver_id"):
-            await db.drivers.update_one(
-                {"id": order["driver_id"]},
-                {"$set": {"status": DriverStatus.AVAILABLE, "current_order_id": None}}
-            )
     
-    result = await db.orders.update_one(
+    order = await db.orders.find_one_and_update(
         {"id": order_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0, "driver_id": 1}
     )
     
-    if result.modified_count == 0:
+    if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    # Free up the driver when order is delivered
+    if status_update.status == OrderStatus.DELIVERED and order.get("driver_id"):
+        await release_driver(order["driver_id"], order_id)
+    
+    await invalidate_cache(DASHBOARD_STATS_KEY, AVAILABLE_DRIVERS_KEY)
     return {"message": "Order status updated"}
 
 
 # Dashboard Stats
 @api_router.get("/dashboard/stats")
 async def get_dashboard_stats():
-    total_orders = await db.orders.count_documents({})
-    pending_orders = await db.orders.count_documents({"status": OrderStatus.PENDING})
-    active_orders = await db.orders.count_documents({
-        "status": {"$in": [OrderStatus.ASSIGNED, OrderStatus.PICKED_UP, OrderStatus.IN_TRANSIT]}
-    })
-    completed_orders = await db.orders.count_documents({"status": OrderStatus.DELIVERED})
-    
-    total_drivers = await db.drivers.count_documents({})
-    available_drivers = await db.drivers.count_documents({"status": DriverStatus.AVAILABLE})
-    busy_drivers = await db.drivers.count_documents({"status": DriverStatus.BUSY})
-    
-    return {
+    cached = await cache_get(DASHBOARD_STATS_KEY)
+    if cached:
+        return Response(content=cached, media_type="application/json")
+
+    # One $group per collection instead of a count_documents call per status
+    pipeline = [{"$group": {"_id": "$status", "n": {"$sum": 1}}}]
+    order_cursor, driver_cursor = await asyncio.gather(
+        db.orders.aggregate(pipeline),
+        db.drivers.aggregate(pipeline),
+    )
+    order_groups, driver_groups = await asyncio.gather(
+        order_cursor.to_list(None),
+        driver_cursor.to_list(None),
+    )
+    order_counts = {group["_id"]: group["n"] for group in order_groups}
+    driver_counts = {group["_id"]: group["n"] for group in driver_groups}
+
+    total_orders = sum(order_counts.values())
+    pending_orders = order_counts.get(OrderStatus.PENDING, 0)
+    active_orders = sum(
+        order_counts.get(status, 0)
+        for status in (OrderStatus.ASSIGNED, OrderStatus.PICKED_UP, OrderStatus.IN_TRANSIT)
+    )
+    completed_orders = order_counts.get(OrderStatus.DELIVERED, 0)
+
+    total_drivers = sum(driver_counts.values())
+    available_drivers = driver_counts.get(DriverStatus.AVAILABLE, 0)
+    busy_drivers = driver_counts.get(DriverStatus.BUSY, 0)
+
+    result = {
         "orders": {
             "total": total_orders,
             "pending": pending_orders,
@@ -382,17 +646,26 @@ async def get_dashboard_stats():
             "busy": busy_drivers
         }
     }
+    await cache_set(DASHBOARD_STATS_KEY, orjson.dumps(result))
+    return result
 
 
+# Parsed once; a frozenset makes the per-request origin check a hash lookup
+# (a "*" entry is short-circuited by the middleware itself)
+CORS_ORIGINS = frozenset(
+    origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',')
+)
+
 # Include the router in the main app
 app.include_router(api_router)
 
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Configure logging
@@ -402,6 +675,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def connect_db_client():
+    # Open the pool before the first request instead of during it
+    await client.admin.command('ping')
+
+
+@app.on_event("startup")
+async def create_indexes():
+    await db.customers.create_index("id", unique=True)
+    await db.customers.create_index("phone")
+    await db.restaurants.create_index([("id", 1)], unique=True)
+    await db.restaurants.create_index("name")
+    await db.drivers.create_index("id", unique=True)
+    await db.drivers.create_index("status")
+    await db.orders.create_index("id", unique=True)
+    await db.orders.create_index([("status", 1), *PAGE_SORT])
+    await db.orders.create_index(PAGE_SORT)
+    await db.customers.create_index(PAGE_SORT)
+    await db.drivers.create_index(PAGE_SORT)
+    await db.restaurants.create_index(PAGE_SORT)
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    # Let the in-flight batch finish so its requests get an answer
+    if _order_flush_task is not None:
+        await _order_flush_task
+    await client.close()
+    await cache.aclose()
+
+
+# Default worker count when WEB_CONCURRENCY is unset. Beyond a few workers
+# each one's share of the Mongo pool gets too small to be useful.
+DEFAULT_MAX_WORKERS = 4
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    workers = int(os.environ.get('WEB_CONCURRENCY', min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)))
+    # Workers import this module afresh and size their pools from this value
+    os.environ['WEB_CONCURRENCY'] = str(workers)
+
+    # Each worker batches only its own concurrent order inserts, and every
+    # create_order waits for its write, so a follow-up call on any worker
+    # sees the order. The Redis cache is shared across workers. Each worker
+    # opens its own Mongo pool, sized by mongo_pool_options() so the total
+    # stays near MONGO_MAX_CONNECTIONS (at least MONGO_MIN_POOL_PER_WORKER
+    # per worker).
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=int(os.environ.get('PORT', 8000)),
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+    )
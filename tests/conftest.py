@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Replace server.db with in-memory collections; returns the namespace."""
+    def install(**collections):
+        namespace = SimpleNamespace(**collections)
+        monkeypatch.setattr(server, "db", namespace)
+        return namespace
+    return install
+
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    async def noop(*keys):
+        pass
+
+    monkeypatch.setattr(server, "invalidate_cache", noop)
@@ -0,0 +1,105 @@
+"""In-memory stand-ins for the Mongo collections used by backend/server.py."""
+import asyncio
+from types import SimpleNamespace
+
+import bson
+from bson.raw_bson import RawBSONDocument
+
+
+def matches(document, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            if key not in document or not document[key] < condition["$lt"]:
+                return False
+        elif document.get(key) != condition:
+            return False
+    return True
+
+
+def plain(document):
+    if isinstance(document, RawBSONDocument):
+        return bson.decode(document.raw)
+    return dict(document)
+
+
+def project(document, projection):
+    if not projection:
+        return dict(document)
+    return {key: document[key] for key, include in projection.items() if include and key in document}
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for key, direction in reversed(keys):
+            self.documents.sort(key=lambda d: d[key], reverse=direction == -1)
+        return self
+
+    def limit(self, limit):
+        self.documents = self.documents[:limit]
+        return self
+
+    async def to_list(self, length):
+        return self.documents if length is None else self.documents[:length]
+
+
+class FakeCollection:
+    """In-memory stand-in for the few AsyncCollection methods server.py uses.
+
+    Exceptions queued in ``failures`` are raised by the next write calls.
+    """
+
+    def __init__(self, documents=(), groups=(), failures=()):
+        self.documents = [dict(document) for document in documents]
+        self.groups = list(groups)
+        self.failures = list(failures)
+        self.inserts = []
+        self.updates = []
+
+    def _maybe_fail(self):
+        if self.failures:
+            raise self.failures.pop(0)
+
+    def _find(self, query):
+        return next((d for d in self.documents if matches(d, query)), None)
+
+    def get(self, **query):
+        return self._find(query)
+
+    def find(self, query=None, projection=None, batch_size=None):
+        return FakeCursor([project(d, projection) for d in self.documents if matches(d, query or {})])
+
+    async def aggregate(self, pipeline):
+        return FakeCursor(self.groups)
+
+    async def insert_many(self, documents, ordered=True):
+        documents = [plain(document) for document in documents]
+        self.inserts.append(documents)
+        await asyncio.sleep(0)
+        self._maybe_fail()
+        self.documents.extend(documents)
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+        self._maybe_fail()
+        document = self._find(query)
+        if document is None:
+            return SimpleNamespace(matched_count=0, modified_count=0)
+        changed = any(document.get(k) != v for k, v in update["$set"].items())
+        document.update(update["$set"])
+        return SimpleNamespace(matched_count=1, modified_count=int(changed))
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=False):
+        self.updates.append((query, update))
+        self._maybe_fail()
+        document = self._find(query)
+        if document is None:
+            return None
+        before = project(document, projection)
+        document.update(update["$set"])
+        return project(document, projection) if return_document else before
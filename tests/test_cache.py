@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+import redis.asyncio as redis
+
+import server
+from tests.fakes import FakeCollection
+
+
+@pytest.fixture
+def unreachable_cache(monkeypatch):
+    # Nothing listens on port 1, so every command fails to connect
+    monkeypatch.setattr(server, "cache", redis.from_url("redis://127.0.0.1:1"))
+
+
+def test_cache_helpers_swallow_redis_errors(unreachable_cache):
+    async def run():
+        assert await server.cache_get(server.DASHBOARD_STATS_KEY) is None
+        await server.cache_set(server.DASHBOARD_STATS_KEY, b"{}")
+        await server.invalidate_cache(server.DASHBOARD_STATS_KEY)
+
+    asyncio.run(run())
+
+
+def test_dashboard_stats_fall_through_to_mongo(unreachable_cache, fake_db):
+    fake_db(
+        orders=FakeCollection(groups=[
+            {"_id": "pending", "n": 2},
+            {"_id": "in_transit", "n": 1},
+            {"_id": "delivered", "n": 3},
+        ]),
+        drivers=FakeCollection(groups=[{"_id": "available", "n": 4}]),
+    )
+
+    stats = asyncio.run(server.get_dashboard_stats())
+
+    assert stats == {
+        "orders": {"total": 6, "pending": 2, "active": 1, "completed": 3},
+        "drivers": {"total": 4, "available": 4, "busy": 0},
+    }
+
+
+def test_cache_set_stores_with_ttl(monkeypatch):
+    calls = []
+
+    class RecordingCache:
+        async def set(self, key, value, ex=None):
+            calls.append((key, value, ex))
+
+    monkeypatch.setattr(server, "cache", RecordingCache())
+
+    asyncio.run(server.cache_set(server.DASHBOARD_STATS_KEY, b"{}"))
+
+    assert calls == [(server.DASHBOARD_STATS_KEY, b"{}", server.CACHE_TTL_SECONDS)]
@@ -0,0 +1,26 @@
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4, 8])
+def test_pool_budget_is_split_across_workers(workers):
+    options = server.mongo_pool_options(workers)
+
+    assert options["maxPoolSize"] * workers <= max(
+        server.MONGO_MAX_CONNECTIONS, server.MONGO_MIN_POOL_PER_WORKER * workers
+    )
+    assert 1 <= options["minPoolSize"] <= options["maxPoolSize"]
+
+
+def test_single_worker_keeps_the_full_pool():
+    assert server.mongo_pool_options(1) == {
+        "maxPoolSize": server.MONGO_MAX_CONNECTIONS,
+        "minPoolSize": server.MONGO_MIN_CONNECTIONS,
+    }
+
+
+def test_many_workers_keep_a_usable_pool():
+    options = server.mongo_pool_options(32)
+
+    assert options == {"maxPoolSize": server.MONGO_MIN_POOL_PER_WORKER, "minPoolSize": 1}
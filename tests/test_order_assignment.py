@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import AutoReconnect
+
+import server
+from tests.fakes import FakeCollection
+
+
+def driver(status="available", current_order_id=None):
+    return {"id": "d1", "name": "Dana", "status": status, "current_order_id": current_order_id}
+
+
+def order(status="pending"):
+    return {"id": "o1", "status": status, "driver_id": None, "driver_name": None}
+
+
+@pytest.fixture
+def install(fake_db, no_cache):
+    def install(drivers, orders):
+        return fake_db(drivers=FakeCollection(drivers), orders=FakeCollection(orders))
+    return install
+
+
+def assign():
+    return asyncio.run(server.assign_order_to_driver("o1", "d1"))
+
+
+def test_assign_claims_driver_and_assigns_order(install):
+    db = install([driver()], [order()])
+
+    assert assign() == {"message": "Order assigned successfully"}
+
+    assert db.drivers.get(id="d1") == driver("busy", "o1")
+    assigned = db.orders.get(id="o1")
+    assert assigned["status"] == "assigned"
+    assert (assigned["driver_id"], assigned["driver_name"]) == ("d1", "Dana")
+    assert assigned["assigned_at"].endswith("Z")
+
+
+@pytest.mark.parametrize("status", ["busy", "offline"])
+def test_unavailable_driver_is_rejected_without_touching_the_order(install, status):
+    db = install([driver(status, "other")], [order()])
+
+    with pytest.raises(HTTPException) as error:
+        assign()
+
+    assert error.value.status_code == 404
+    assert db.orders.updates == []
+    assert db.drivers.get(id="d1") == driver(status, "other")
+
+
+def test_order_that_is_not_pending_releases_the_driver(install):
+    db = install([driver()], [order("assigned")])
+
+    with pytest.raises(HTTPException) as error:
+        assign()
+
+    assert error.value.status_code == 404
+    assert db.drivers.get(id="d1") == driver()
+
+
+def test_failed_order_update_releases_the_driver(install):
+    db = install([driver()], [order()])
+    db.orders.failures = [AutoReconnect("connection reset")]
+
+    with pytest.raises(AutoReconnect):
+        assign()
+
+    assert db.drivers.get(id="d1") == driver()
+    assert db.orders.get(id="o1") == order()
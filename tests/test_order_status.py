@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from server import OrderStatusUpdate
+from tests.fakes import FakeCollection
+
+
+def update_status(status, order_id="o1"):
+    return asyncio.run(server.update_order_status(order_id, OrderStatusUpdate(status=status)))
+
+
+@pytest.fixture
+def db(fake_db, no_cache):
+    return fake_db(
+        orders=FakeCollection([{"id": "o1", "status": "in_transit", "driver_id": "d1"}]),
+        drivers=FakeCollection([
+            {"id": "d1", "status": "busy", "current_order_id": "o1"},
+            {"id": "d2", "status": "busy", "current_order_id": "o2"},
+        ]),
+    )
+
+
+def test_delivery_frees_the_driver_on_this_order(db):
+    update_status("delivered")
+
+    delivered = db.orders.get(id="o1")
+    assert delivered["status"] == "delivered"
+    assert delivered["delivered_at"].endswith("Z")
+    assert db.drivers.get(id="d1") == {"id": "d1", "status": "available", "current_order_id": None}
+
+
+def test_delivery_leaves_a_driver_that_moved_on(db):
+    # d1 was already reassigned to another order before this one is delivered
+    db.drivers.get(id="d1")["current_order_id"] = "o3"
+
+    update_status("delivered")
+
+    assert db.drivers.get(id="d1") == {"id": "d1", "status": "busy", "current_order_id": "o3"}
+
+
+def test_other_statuses_do_not_touch_drivers(db):
+    update_status("picked_up")
+
+    assert db.orders.get(id="o1")["picked_up_at"].endswith("Z")
+    assert db.drivers.updates == []
+
+
+def test_resending_the_current_status_succeeds(db):
+    assert update_status("in_transit") == {"message": "Order status updated"}
+
+
+def test_unknown_order_is_not_found(db):
+    with pytest.raises(HTTPException) as error:
+        update_status("delivered", order_id="missing")
+
+    assert error.value.status_code == 404
+    assert db.drivers.updates == []
+
+
+def test_handler_timestamps_match_model_dump_format():
+    stamped = server.utc_now_json()
+    dumped = server.Order.model_validate({
+        "customer_id": "c", "customer_name": "n", "customer_phone": "p",
+        "delivery_address": "a", "restaurant_id": "r", "restaurant_name": "r",
+        "items": [], "total_amount": 0, "delivered_at": stamped,
+    }).model_dump(mode="json")
+
+    assert dumped["delivered_at"] == stamped
+    assert stamped.endswith("Z") and dumped["created_at"].endswith("Z")
@@ -0,0 +1,40 @@
+import pytest
+from pydantic import ValidationError
+
+import server
+from server import OrderItem
+
+
+def make_items(count):
+    return [
+        OrderItem(name=f"item {i}", quantity=i % 7 + 1, price=round(0.37 * i + 1.99, 2))
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("count", [
+    1,
+    server.VECTORIZED_TOTAL_MIN_ITEMS - 1,
+    server.VECTORIZED_TOTAL_MIN_ITEMS,
+    server.VECTORIZED_TOTAL_MIN_ITEMS + 1,
+    500,
+])
+def test_total_matches_plain_sum(count):
+    items = make_items(count)
+
+    assert server.order_total(items) == pytest.approx(
+        sum(item.price * item.quantity for item in items)
+    )
+
+
+def test_total_accepts_largest_quantity_on_both_paths():
+    item = OrderItem(name="bulk", quantity=2**63 - 1, price=1.0)
+
+    for count in (1, server.VECTORIZED_TOTAL_MIN_ITEMS):
+        assert server.order_total([item] * count) == pytest.approx(float(2**63 - 1) * count)
+
+
+@pytest.mark.parametrize("quantity", [0, -1, 2**63])
+def test_out_of_range_quantity_is_rejected(quantity):
+    with pytest.raises(ValidationError):
+        OrderItem(name="bad", quantity=quantity, price=1.0)
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import AutoReconnect, BulkWriteError, ServerSelectionTimeoutError
+
+import server
+from tests.fakes import FakeCollection
+
+
+@pytest.fixture
+def orders(monkeypatch, fake_db):
+    fake = fake_db(orders=FakeCollection()).orders
+    monkeypatch.setattr(server, "_order_buffer", [])
+    monkeypatch.setattr(server, "_order_flush_task", None)
+    monkeypatch.setattr(server, "ORDER_WRITE_RETRY_DELAY", 0)
+    return fake
+
+
+async def insert_all(*documents):
+    return await asyncio.gather(
+        *(server.insert_order(document) for document in documents),
+        return_exceptions=True,
+    )
+
+
+def test_concurrent_orders_share_one_insert(orders):
+    results = asyncio.run(insert_all(*({"id": str(i)} for i in range(5))))
+
+    assert results == [None] * 5
+    assert orders.inserts == [[{"id": str(i)} for i in range(5)]]
+
+
+def test_orders_are_split_into_batches(orders, monkeypatch):
+    monkeypatch.setattr(server, "ORDER_BATCH_SIZE", 2)
+
+    results = asyncio.run(insert_all(*({"id": str(i)} for i in range(5))))
+
+    assert results == [None] * 5
+    assert [len(call) for call in orders.inserts] == [2, 2, 1]
+
+
+def test_transient_failure_is_retried(orders):
+    orders.failures = [AutoReconnect("connection reset")]
+
+    results = asyncio.run(insert_all({"id": "a"}, {"id": "b"}))
+
+    assert results == [None, None]
+    assert len(orders.inserts) == 2
+    assert orders.inserts[1] == [{"id": "a"}, {"id": "b"}]
+
+
+def test_duplicate_key_on_retry_counts_as_written(orders):
+    orders.failures = [
+        AutoReconnect("connection reset"),
+        BulkWriteError({"writeErrors": [{"index": 0, "code": 11000}]}),
+    ]
+
+    results = asyncio.run(insert_all({"id": "a"}, {"id": "b"}))
+
+    assert results == [None, None]
+
+
+def test_persistent_failure_is_reported_to_every_request(orders):
+    orders.failures = [AutoReconnect("down")] * server.ORDER_WRITE_RETRIES
+
+    results = asyncio.run(insert_all({"id": "a"}, {"id": "b"}))
+
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert all(result.status_code == 503 for result in results)
+
+
+def test_unreachable_server_fails_the_whole_queue_at_once(orders, monkeypatch):
+    monkeypatch.setattr(server, "ORDER_BATCH_SIZE", 2)
+    orders.failures = [ServerSelectionTimeoutError("no servers")]
+
+    results = asyncio.run(insert_all(*({"id": str(i)} for i in range(5))))
+
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert all(result.status_code == 503 for result in results)
+    # Not retried, and the queued batches were not attempted either
+    assert len(orders.inserts) == 1
+    assert server._order_buffer == []
+
+
+def test_document_error_only_fails_that_order(orders):
+    orders.failures = [BulkWriteError({"writeErrors": [{"index": 1, "code": 2}]})]
+
+    results = asyncio.run(insert_all({"id": "a"}, {"id": "b"}, {"id": "c"}))
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 503
+
+
+def test_oversized_order_is_rejected_before_buffering(orders, monkeypatch):
+    monkeypatch.setattr(server, "MAX_ORDER_BSON_SIZE", 1024)
+
+    results = asyncio.run(insert_all({"id": "big", "notes": "x" * 1024}, {"id": "good"}))
+
+    assert isinstance(results[0], HTTPException)
+    assert results[0].status_code == 422
+    assert results[1] is None
+    assert orders.inserts == [[{"id": "good"}]]
+
+
+def test_shutdown_waits_for_in_flight_batch(orders, monkeypatch):
+    async def close():
+        pass
+
+    monkeypatch.setattr(server, "client", SimpleNamespace(close=close))
+    monkeypatch.setattr(server, "cache", SimpleNamespace(aclose=close))
+
+    async def run():
+        request = asyncio.create_task(server.insert_order({"id": "a"}))
+        await asyncio.sleep(0)
+        await server.shutdown_db_client()
+        assert request.done()
+        await request
+
+    asyncio.run(run())
+    assert orders.inserts == [[{"id": "a"}]]
@@ -0,0 +1,66 @@
+import asyncio
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+import server
+from tests.fakes import FakeCollection
+
+
+def fetch_all(collection, limit, filter_dict=None):
+    pages, after = [], None
+    while True:
+        response = asyncio.run(server.find_page(collection, filter_dict or {}, None, limit, after))
+        pages.append([d["id"] for d in orjson.loads(response.body)])
+        after = response.headers.get(server.NEXT_CURSOR_HEADER)
+        if after is None:
+            return pages
+
+
+def test_pages_do_not_skip_documents_sharing_a_timestamp():
+    # Five documents share the timestamp that falls on a page boundary
+    documents = [{"id": f"{i:02d}", "created_at": "2026-01-01T00:00:00Z"} for i in range(5)]
+    documents += [{"id": f"{i:02d}", "created_at": f"2026-01-0{i - 3}T00:00:00Z"} for i in range(5, 9)]
+    collection = FakeCollection(documents)
+
+    pages = fetch_all(collection, limit=3)
+
+    ids = [i for page in pages for i in page]
+    assert sorted(ids) == sorted(d["id"] for d in documents)
+    assert len(ids) == len(set(ids))
+    assert all(len(page) <= 3 for page in pages)
+
+
+def test_pages_keep_the_status_filter():
+    documents = [
+        {"id": f"{i:02d}", "created_at": "2026-01-01T00:00:00Z", "status": "pending" if i % 2 else "delivered"}
+        for i in range(7)
+    ]
+
+    pages = fetch_all(FakeCollection(documents), limit=2, filter_dict={"status": "pending"})
+
+    assert [i for page in pages for i in page] == ["05", "03", "01"]
+
+
+def test_omitted_limit_returns_up_to_list_limit(monkeypatch):
+    monkeypatch.setattr(server, "LIST_LIMIT", 4)
+    documents = [{"id": str(i), "created_at": f"2026-01-0{i + 1}T00:00:00Z"} for i in range(3)]
+
+    response = asyncio.run(server.find_page(FakeCollection(documents), {}, None, None, None))
+
+    assert len(orjson.loads(response.body)) == 3
+    assert server.NEXT_CURSOR_HEADER.lower() not in response.headers
+
+
+def test_cursor_round_trip():
+    document = {"id": "abc", "created_at": "2026-01-01T00:00:00Z"}
+
+    assert server.decode_cursor(server.encode_cursor(document)) == ("2026-01-01T00:00:00Z", "abc")
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm90IGpzb24", "WzEsIDJd"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        server.decode_cursor(cursor)
+    assert error.value.status_code == 400